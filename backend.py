@@ -1,15 +1,23 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, QueryParams
 import tensorflow as tf
-from tensorflow import keras
 import numpy as np
-from PIL import Image
-import io
-import base64
+import asyncio
+import functools
+import gzip
+import pybase64 as base64  # SIMD-accelerated drop-in for the stdlib module
+import hashlib
+import os
+import threading
+import time
 from pathlib import Path
 import cv2
+import msgpack
+from cachetools import TTLCache
+import config
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -27,33 +35,173 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount the Stats folder so static HTML reports can be served
+# Unbounded so every report warmed at startup stays cached; the Stats folder is a fixed, small set of files
+@functools.lru_cache(maxsize=None)
+def gzip_file(path: str, mtime_ns: int):
+    """Gzip a static file once per modification time and keep the compressed bytes in memory"""
+    return gzip.compress(Path(path).read_bytes(), compresslevel=5)
+
+def strip_etag(value: str):
+    """Reduce an ETag to its bare opaque tag, dropping any W/ prefix and surrounding quotes"""
+    value = value.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    return value.strip('"')
+
+class GzipStaticFiles(StaticFiles):
+    """StaticFiles that serves HTML reports gzip-compressed from an in-memory cache"""
+    
+    async def get_response(self, path, scope):
+        response = await self.get_encoded_response(path, scope)
+        # HTML may be served gzipped or not depending on the request, so caches must key on Accept-Encoding
+        if path.endswith(".html"):
+            response.headers["Vary"] = "Accept-Encoding"
+        # A ?v= version in the URL pins the content, so browsers may keep it indefinitely;
+        # unversioned URLs are revalidated against the ETag on every use
+        if "v" in QueryParams(scope["query_string"]):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+    
+    async def get_encoded_response(self, path, scope):
+        """Fetch the file response, swapping in the cached gzip body when the client accepts it"""
+        response = await super().get_response(path, scope)
+        # Only 200 HTML responses are rewritten; 304 Not Modified responses pass through untouched
+        if (
+            not isinstance(response, FileResponse)
+            or response.status_code != 200
+            or not path.endswith(".html")
+            or "gzip" not in Headers(scope=scope).get("accept-encoding", "")
+        ):
+            return response
+        
+        headers = {
+            key: value for key, value in response.headers.items()
+            if key in ("etag", "last-modified")
+        }
+        # The compressed variant is a different representation, so it needs its own validator;
+        # Starlette versions differ on whether the ETag is quoted, so normalize before suffixing
+        if "etag" in headers:
+            tag = f"{strip_etag(headers['etag'])}-gzip"
+            headers["etag"] = f'"{tag}"'
+            # The parent only matched the identity ETag, so revalidation of the gzip ETag is answered here
+            if_none_match = Headers(scope=scope).get("if-none-match", "")
+            if tag in [strip_etag(value) for value in if_none_match.split(",")]:
+                return Response(status_code=304, headers=headers)
+        
+        stat = os.stat(response.path)
+        body = await asyncio.to_thread(gzip_file, os.path.realpath(response.path), stat.st_mtime_ns)
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=body, media_type="text/html", headers=headers)
+
+# Mount the Stats folder so static HTML reports can be served (Plotly HTML gzips to ~20% of its size)
 stats_path = Path("Stats")
 if stats_path.exists():
-    app.mount("/stats", StaticFiles(directory=str(stats_path)), name="stats")
+    app.mount("/stats", GzipStaticFiles(directory=str(stats_path)), name="stats")
 else:
     print("⚠️ Stats folder not found; /stats endpoint will not be available until the folder exists")
 
 # Model path
 MODEL_PATH = "unet_brain_tumor_final.keras"
 
+# Optional int8-quantized export of the model (see convert_tflite.py); used for inference when present
+TFLITE_MODEL_PATH = "unet_brain_tumor_int8.tflite"
+
 # Global model variable
 model = None
 
+# Traced inference function wrapping the model (built once the model is loaded)
+predict_fn = None
+
+# TFLite interpreter for the quantized model, if one was exported
+interpreter = None
+
+# zlib level for response PNGs: the images are small, short-lived visualizations, so encode
+# speed matters more than the few extra bytes over PIL's default level
+PNG_COMPRESSION_LEVEL = 1
+
+# Recent segmentation results keyed by model version + a hash of the uploaded image bytes,
+# kept in memory for PREDICTION_CACHE_TTL seconds and persisted to PREDICTION_CACHE_DIR
+PREDICTION_CACHE_SIZE = 128
+PREDICTION_CACHE_TTL = 600
+PREDICTION_CACHE_DIR = Path("predictions")
+PREDICTION_CACHE_MAX_FILES = 512
+PREDICTION_CACHE_PRUNE_EVERY = 32
+prediction_cache_writes = 0
+prediction_cache = TTLCache(maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL)
+
+# Micro-batching: concurrent /predict calls are queued and run through the model together,
+# up to MICRO_BATCH_MAX_SIZE images or after waiting MICRO_BATCH_TIMEOUT seconds for more
+MICRO_BATCH_MAX_SIZE = 8
+MICRO_BATCH_TIMEOUT = 0.005
+inference_queue = None
+batch_worker_task = None
+
+# Model calls run in worker threads; the TFLite interpreter isn't thread-safe, so they go one at a time
+inference_lock = threading.Lock()
+
+# Background task that gzips the Stats reports at startup
+precompress_task = None
+
+# Fingerprint of the loaded model files; part of every cache key so new weights invalidate old results
+model_version = "none"
+
 # Custom Dice Coefficient metric (needed for model loading)
+@tf.function(reduce_retracing=True)
 def dice_coef(y_true, y_pred, smooth=1e-7):
     """
     Dice coefficient metric for binary segmentation
     """
-    y_true_f = tf.keras.backend.flatten(y_true)
-    y_pred_f = tf.keras.backend.flatten(y_pred)
-    intersection = tf.keras.backend.sum(y_true_f * y_pred_f)
-    return (2. * intersection + smooth) / (tf.keras.backend.sum(y_true_f) + tf.keras.backend.sum(y_pred_f) + smooth)
+    # Full reductions over the tensors; no flatten needed, and XLA can fuse the three sums
+    intersection = tf.reduce_sum(y_true * y_pred)
+    return (2. * intersection + smooth) / (tf.reduce_sum(y_true) + tf.reduce_sum(y_pred) + smooth)
+
+def configure_tensorflow():
+    """Apply device and threading settings from config.py before the model is built"""
+    gpus = tf.config.list_physical_devices('GPU')
+    if not config.ENABLE_GPU:
+        tf.config.set_visible_devices([], 'GPU')
+    elif config.TF_MEMORY_GROWTH:
+        # Allocate GPU memory on demand instead of reserving it all up front
+        for gpu in gpus:
+            tf.config.experimental.set_memory_growth(gpu, True)
+    
+    # Split CPU cores between worker processes so they don't oversubscribe each other
+    if config.API_WORKERS > 1:
+        threads = max(1, (os.cpu_count() or 1) // config.API_WORKERS)
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+
+@app.on_event("startup")
+async def precompress_stats():
+    """Gzip every Stats HTML report up front so the first browser request is served from memory"""
+    global precompress_task
+    if not stats_path.exists():
+        return
+    
+    def warm():
+        for html_path in stats_path.rglob("*.html"):
+            gzip_file(os.path.realpath(html_path), html_path.stat().st_mtime_ns)
+    
+    def report(task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️ Could not pre-compress Stats reports: {str(task.exception())}")
+    
+    # Runs in the background so a large Stats folder doesn't delay startup
+    precompress_task = asyncio.create_task(asyncio.to_thread(warm))
+    precompress_task.add_done_callback(report)
+
+@app.on_event("startup")
+async def start_batch_worker():
+    """Start the background task that micro-batches /predict inference"""
+    global inference_queue, batch_worker_task
+    inference_queue = asyncio.Queue()
+    batch_worker_task = asyncio.create_task(batch_worker())
 
 @app.on_event("startup")
 async def load_model():
     """Load the trained model on startup"""
-    global model
+    global model, predict_fn, interpreter, model_version
     try:
         model_path = Path(MODEL_PATH)
         if not model_path.exists():
@@ -61,73 +209,197 @@ async def load_model():
             print("⚠️ API will run but predictions will fail until model is available")
             return
         
-        # Load model with custom objects
+        configure_tensorflow()
+        
+        # Load model with custom objects (Keras is only needed here)
+        from tensorflow import keras
         model = keras.models.load_model(
             MODEL_PATH,
             custom_objects={'dice_coef': dice_coef}
         )
+        
+        # Trace inference once; calling the model directly skips the dataset/callback scaffolding
+        # that model.predict() sets up on every call. XLA compiles one program per input shape, so
+        # with it enabled the batch size is pinned and run_inference pads batches to fit.
+        batch_dim = MICRO_BATCH_MAX_SIZE if config.ENABLE_XLA else None
+        predict_fn = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec([batch_dim, 128, 128, 1], tf.float32)],
+            jit_compile=config.ENABLE_XLA
+        )
+        if config.ENABLE_XLA:
+            # Compile the single shape now rather than on the first request
+            predict_fn(np.zeros((MICRO_BATCH_MAX_SIZE, 128, 128, 1), dtype=np.float32))
         print("✅ Model loaded successfully!")
         print(f"📊 Model input shape: {model.input_shape}")
         print(f"📊 Model output shape: {model.output_shape}")
+        
+        # Prefer the int8 TFLite model for inference when it has been exported
+        if Path(TFLITE_MODEL_PATH).exists():
+            interpreter = tf.lite.Interpreter(model_path=TFLITE_MODEL_PATH)
+            interpreter.allocate_tensors()
+            print(f"⚡ Using quantized TFLite model for inference: {TFLITE_MODEL_PATH}")
+        
+        # Fingerprint the weights actually used for inference
+        weights = Path(TFLITE_MODEL_PATH) if interpreter is not None else model_path
+        weights_stat = weights.stat()
+        model_version = hashlib.blake2b(
+            f"{weights.name}:{weights_stat.st_size}:{weights_stat.st_mtime_ns}".encode(),
+            digest_size=4
+        ).hexdigest()
+        
+        # Drop disk cache entries left behind by earlier model versions or past their TTL
+        prune_prediction_cache()
     except Exception as e:
         print(f"❌ Error loading model: {str(e)}")
         print("⚠️ API will run but predictions will fail")
 
-def preprocess_image(image: Image.Image, target_size=(128, 128)):
+def run_inference(batch: np.ndarray):
+    """
+    Run the segmentation model on a preprocessed batch
+    Args:
+        batch: float32 array of shape (N, 128, 128, 1)
+    Returns:
+        Predicted masks as a numpy array of shape (N, 128, 128, 1)
+    """
+    with inference_lock:
+        if interpreter is None and config.ENABLE_XLA:
+            # Zero-pad to whole MICRO_BATCH_MAX_SIZE chunks so the one compiled shape serves every batch
+            count = len(batch)
+            padded = np.zeros((-(-count // MICRO_BATCH_MAX_SIZE) * MICRO_BATCH_MAX_SIZE, *batch.shape[1:]), dtype=np.float32)
+            padded[:count] = batch
+            chunks = [predict_fn(padded[i:i + MICRO_BATCH_MAX_SIZE]).numpy() for i in range(0, len(padded), MICRO_BATCH_MAX_SIZE)]
+            return np.concatenate(chunks)[:count]
+        if interpreter is None:
+            return predict_fn(batch).numpy()
+        
+        input_details = interpreter.get_input_details()[0]
+        if tuple(input_details['shape']) != batch.shape:
+            interpreter.resize_tensor_input(input_details['index'], batch.shape)
+            interpreter.allocate_tensors()
+        interpreter.set_tensor(input_details['index'], batch)
+        interpreter.invoke()
+        return interpreter.get_tensor(interpreter.get_output_details()[0]['index'])
+
+async def infer_batched(image: np.ndarray):
+    """
+    Queue one preprocessed image for the micro-batcher and wait for its prediction
+    Args:
+        image: float32 array of shape (128, 128, 1)
+    Returns:
+        Predicted mask of shape (128, 128, 1)
+    """
+    future = asyncio.get_running_loop().create_future()
+    await inference_queue.put((image, future))
+    return await future
+
+async def batch_worker():
+    """Drain queued images into micro-batches and run each batch through the model in one call"""
+    loop = asyncio.get_running_loop()
+    while True:
+        items = [await inference_queue.get()]
+        
+        # Take whatever is already queued; a lone request is dispatched right away instead of paying the window
+        while len(items) < MICRO_BATCH_MAX_SIZE and not inference_queue.empty():
+            items.append(inference_queue.get_nowait())
+        
+        # Under concurrent load, give other requests a short window to join this batch
+        deadline = loop.time() + MICRO_BATCH_TIMEOUT
+        while 1 < len(items) < MICRO_BATCH_MAX_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(inference_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        try:
+            # Off the event loop, so requests keep being accepted and queued while the model runs
+            predictions = await asyncio.to_thread(run_inference, np.stack([image for image, _ in items], axis=0))
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        
+        # Results go back in queue order; requests whose client went away are skipped
+        for (_, future), prediction in zip(items, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+def decode_image(image_data: bytes):
+    """
+    Decode uploaded image bytes straight into a grayscale numpy array
+    Args:
+        image_data: Raw encoded image bytes (PNG, JPEG, ...)
+    Returns:
+        uint8 numpy array of shape (height, width)
+    """
+    image = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError("Could not decode image")
+    return image
+
+def preprocess_image(image: np.ndarray, target_size=(128, 128)):
     """
     Preprocess the input image for model prediction
     Args:
-        image: PIL Image object
+        image: Grayscale uint8 numpy array (see decode_image)
         target_size: Target size for the model (height, width)
     Returns:
         Preprocessed numpy array
     """
-    # Convert to grayscale if needed
-    if image.mode != 'L':
-        image = image.convert('L')
+    # Resize to model input size (OpenCV's SIMD resize; dsize is (width, height))
+    img_array = cv2.resize(image, (target_size[1], target_size[0]), interpolation=cv2.INTER_AREA)
     
-    # Resize to model input size
-    image = image.resize(target_size, Image.LANCZOS)
+    # Normalize to [0, 1] in place: one float32 copy, then a single vectorized multiply pass
+    img_array = img_array.astype(np.float32)
+    np.multiply(img_array, np.float32(1.0 / 255.0), out=img_array)
     
-    # Convert to numpy array
-    img_array = np.array(image, dtype=np.float32)
-    
-    # Normalize to [0, 1]
-    if img_array.max() > 1.0:
-        img_array = img_array / 255.0
-    
-    # Add channel dimension and batch dimension
-    img_array = np.expand_dims(img_array, axis=-1)  # (128, 128, 1)
-    img_array = np.expand_dims(img_array, axis=0)   # (1, 128, 128, 1)
-    
-    return img_array
+    # Add batch and channel dimensions without copying
+    return img_array.reshape(1, target_size[0], target_size[1], 1)  # (1, 128, 128, 1)
+
+def decode_and_preprocess(image_data: bytes):
+    """Decode uploaded bytes and preprocess them into a single (128, 128, 1) model input"""
+    return preprocess_image(decode_image(image_data))[0]
+
+# Per-intensity lookup tables reproducing cv2.addWeighted(rgb, 0.7, red_mask, 0.3, 0):
+# every channel keeps 0.7 * I, and the red channel adds 0.3 * 255 where the tumor mask is set
+_BLEND_BACKGROUND_LUT = np.clip(np.rint(np.arange(256) * 0.7), 0, 255).astype(np.uint8)
+_BLEND_TUMOR_LUT = np.clip(np.rint(np.arange(256) * 0.7 + 255 * 0.3), 0, 255).astype(np.uint8)
+
+# Overlay output buffer reused across requests. Requests are processed one at a time on the
+# event loop, and the overlay is PNG-encoded before the next one is built.
+_OVERLAY_BUF = np.empty((128, 128, 3), dtype=np.uint8)
+
+# Thresholded mask buffer reused the same way, shared by the pixel count and the overlay
+_MASK_BOOL = np.empty((128, 128), dtype=bool)
 
 def create_segmentation_overlay(original_img: np.ndarray, mask: np.ndarray):
     """
     Create an overlay visualization of the segmentation mask on the original image
     Args:
         original_img: Original grayscale image (128, 128)
-        mask: Binary segmentation mask (128, 128)
+        mask: Segmentation mask (128, 128), as probabilities or already thresholded to bool
     Returns:
-        RGB image with overlay
+        RGB image with overlay (a shared buffer; encode or copy it before the next call)
     """
     # Normalize original image to [0, 255]
     if original_img.max() <= 1.0:
         original_img = (original_img * 255).astype(np.uint8)
     
-    # Create RGB version of original image
-    rgb_img = cv2.cvtColor(original_img, cv2.COLOR_GRAY2RGB)
-    
-    # Create colored mask (red for tumor)
-    colored_mask = np.zeros_like(rgb_img)
-    colored_mask[:, :, 0] = (mask > 0.5).astype(np.uint8) * 255  # Red channel
+    overlay = _OVERLAY_BUF if original_img.shape == _OVERLAY_BUF.shape[:2] else np.empty(original_img.shape + (3,), dtype=np.uint8)
+    mask_binary = mask if mask.dtype == np.bool_ else mask > 0.5
     
-    # Blend original and mask
-    overlay = cv2.addWeighted(rgb_img, 0.7, colored_mask, 0.3, 0)
+    # Blend original and red tumor mask straight into the output buffer
+    background = _BLEND_BACKGROUND_LUT[original_img]
+    overlay[:, :, 0] = np.where(mask_binary, _BLEND_TUMOR_LUT[original_img], background)  # Red channel
+    overlay[:, :, 1] = background
+    overlay[:, :, 2] = background
     
     # Add contours for better visibility
-    mask_binary = (mask > 0.5).astype(np.uint8)
-    contours, _ = cv2.findContours(mask_binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    contours, _ = cv2.findContours(mask_binary.view(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     cv2.drawContours(overlay, contours, -1, (0, 255, 0), 2)  # Green contours
     
     return overlay
@@ -141,12 +413,13 @@ async def root():
         "model_loaded": model is not None,
         "endpoints": {
             "POST /predict": "Predict tumor segmentation from uploaded image",
+            "POST /predict-binary": "Predict tumor segmentation and return the PNG directly",
             "GET /health": "Check API health status",
             "GET /model-info": "Get model information"
         }
     }
 
-@app.get("/health")
+@app.api_route("/health", methods=["GET", "HEAD"])  # HEAD lets clients probe liveness without a body
 async def health_check():
     """Health check endpoint"""
     return {
@@ -169,6 +442,182 @@ async def model_info():
         "architecture": "U-Net 2D"
     }
 
+def encode_png(image: np.ndarray):
+    """
+    Encode a grayscale or RGB uint8 array as PNG bytes
+    Args:
+        image: Array of shape (H, W) or (H, W, 3) in RGB order
+    Returns:
+        PNG file contents as bytes
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)  # OpenCV encodes BGR channel order
+    ok, buffer = cv2.imencode(".png", image, [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION_LEVEL])
+    if not ok:
+        raise ValueError("Could not encode PNG")
+    return buffer.tobytes()
+
+def encode_multipart_pngs(parts: dict):
+    """
+    Pack several PNGs into a single multipart/mixed body
+    Args:
+        parts: Mapping of part name to PNG bytes, in the order they should appear
+    Returns:
+        Tuple of (body bytes, content type including the boundary)
+    """
+    boundary = os.urandom(16).hex()
+    body = b"".join(
+        f'--{boundary}\r\nContent-Type: image/png\r\nContent-Disposition: inline; name="{name}"\r\n\r\n'.encode()
+        + png_bytes + b"\r\n"
+        for name, png_bytes in parts.items()
+    )
+    body += f"--{boundary}--\r\n".encode()
+    return body, f"multipart/mixed; boundary={boundary}"
+
+def load_cached_prediction(cache_key: str):
+    """
+    Look up a segmentation result in the memory cache, then on disk
+    Args:
+        cache_key: Key built from the model version and the image hash
+    Returns:
+        Cached result dict, or None on a miss
+    """
+    result = prediction_cache.get(cache_key)
+    if result is not None:
+        return result
+    
+    cache_file = PREDICTION_CACHE_DIR / f"{cache_key}.msgpack"
+    try:
+        # Disk entries expire on the same schedule as the memory cache
+        if time.time() - cache_file.stat().st_mtime > PREDICTION_CACHE_TTL:
+            cache_file.unlink(missing_ok=True)
+            return None
+        result = msgpack.unpackb(cache_file.read_bytes(), raw=False)
+    except (OSError, ValueError):
+        return None
+    
+    prediction_cache[cache_key] = result
+    return result
+
+def save_cached_prediction(cache_key: str, result: dict):
+    """Store a segmentation result in the memory cache and on disk"""
+    global prediction_cache_writes
+    prediction_cache[cache_key] = result
+    try:
+        PREDICTION_CACHE_DIR.mkdir(exist_ok=True)
+        cache_file = PREDICTION_CACHE_DIR / f"{cache_key}.msgpack"
+        tmp_file = cache_file.with_suffix(f".tmp{os.getpid()}")
+        tmp_file.write_bytes(msgpack.packb(result, use_bin_type=True))
+        os.replace(tmp_file, cache_file)
+        
+        # Pruning scans the whole directory, so only do it every few writes
+        prediction_cache_writes += 1
+        if prediction_cache_writes % PREDICTION_CACHE_PRUNE_EVERY == 0:
+            prune_prediction_cache()
+    except OSError as e:
+        print(f"⚠️ Could not write prediction cache: {str(e)}")
+
+def prune_prediction_cache():
+    """
+    Bound the on-disk prediction cache
+    Removes entries that are expired or belong to another model version, then the oldest
+    entries beyond PREDICTION_CACHE_MAX_FILES
+    """
+    if not PREDICTION_CACHE_DIR.exists():
+        return
+    
+    now = time.time()
+    entries = []
+    with os.scandir(PREDICTION_CACHE_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".msgpack"):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+                if now - mtime > PREDICTION_CACHE_TTL or not entry.name.startswith(f"{model_version}-"):
+                    os.unlink(entry.path)
+                else:
+                    entries.append((mtime, entry.path))
+            except OSError:
+                continue
+    
+    # Oldest first, so whatever is beyond the cap gets removed
+    entries.sort()
+    for _, path in entries[:max(0, len(entries) - PREDICTION_CACHE_MAX_FILES)]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+async def segment_image(image_data: bytes):
+    """
+    Run the full segmentation pipeline on uploaded image bytes
+    Args:
+        image_data: Raw encoded image bytes
+    Returns:
+        Dict with tumor statistics and the overlay/mask encoded as PNG bytes
+    """
+    # Identical uploads (e.g. repeated clicks on the same test image) reuse the cached result
+    cache_key = f"{model_version}-{hashlib.blake2b(image_data, digest_size=16).hexdigest()}"
+    cached_result = load_cached_prediction(cache_key)
+    if cached_result is not None:
+        return cached_result
+    
+    # Decode image
+    image = decode_image(image_data)
+    
+    # Store original size as (width, height)
+    original_size = (image.shape[1], image.shape[0])
+    
+    # Preprocess image
+    processed_img = preprocess_image(image)
+    
+    # Make prediction (batched together with any concurrent requests)
+    prediction = await infer_batched(processed_img[0])
+    
+    # Extract mask
+    mask = prediction[:, :, 0]  # (128, 128)
+    
+    # Threshold once into the reusable buffer and count tumor pixels from it
+    mask_binary = _MASK_BOOL if mask.shape == _MASK_BOOL.shape else np.empty(mask.shape, dtype=bool)
+    np.greater(mask, 0.5, out=mask_binary)
+    
+    # Calculate statistics
+    tumor_pixels = int(np.count_nonzero(mask_binary))
+    total_pixels = mask.shape[0] * mask.shape[1]
+    tumor_percentage = (tumor_pixels / total_pixels) * 100
+    
+    # Get original image array for overlay
+    original_img_array = processed_img[0, :, :, 0]  # (128, 128)
+    
+    # Create visualization
+    overlay_img = create_segmentation_overlay(original_img_array, mask_binary)
+    
+    # Resize back to original size if needed (bilinear is plenty for a tinted overlay)
+    if original_size != (128, 128):
+        overlay_img = cv2.resize(overlay_img, original_size, interpolation=cv2.INTER_LINEAR)
+    
+    # Encode overlay as PNG
+    segmented_png = encode_png(overlay_img)
+    
+    # Also encode mask as PNG
+    mask_img = (mask * 255).astype(np.uint8)
+    if original_size != (128, 128):
+        mask_img = cv2.resize(mask_img, original_size, interpolation=cv2.INTER_NEAREST)  # Keep mask edges crisp
+    mask_png = encode_png(mask_img)
+    
+    result = {
+        "tumor_pixels": tumor_pixels,
+        "total_pixels": total_pixels,
+        "tumor_percentage": round(tumor_percentage, 2),
+        "segmented_png": segmented_png,
+        "mask_png": mask_png,
+        "original_size": list(original_size)
+    }
+    save_cached_prediction(cache_key, result)
+    
+    return result
+
 @app.post("/predict")
 async def predict_tumor(file: UploadFile = File(...)):
     """
@@ -189,67 +638,72 @@ async def predict_tumor(file: UploadFile = File(...)):
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
         
-        # Read image file
+        # Read image file and run segmentation
         image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Store original size
-        original_size = image.size
-        
-        # Preprocess image
-        processed_img = preprocess_image(image)
-        
-        # Make prediction
-        prediction = model.predict(processed_img, verbose=0)
-        
-        # Extract mask
-        mask = prediction[0, :, :, 0]  # (128, 128)
-        
-        # Calculate statistics
-        tumor_pixels = int(np.sum(mask > 0.5))
-        total_pixels = mask.shape[0] * mask.shape[1]
-        tumor_percentage = (tumor_pixels / total_pixels) * 100
-        
-        # Get original image array for overlay
-        original_img_array = processed_img[0, :, :, 0]  # (128, 128)
-        
-        # Create visualization
-        overlay_img = create_segmentation_overlay(original_img_array, mask)
-        
-        # Convert overlay to PIL Image
-        overlay_pil = Image.fromarray(overlay_img)
-        
-        # Resize back to original size if needed
-        if original_size != (128, 128):
-            overlay_pil = overlay_pil.resize(original_size, Image.LANCZOS)
-        
-        # Convert to base64 for JSON response
-        buffered = io.BytesIO()
-        overlay_pil.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        
-        # Also convert mask to base64
-        mask_img = Image.fromarray((mask * 255).astype(np.uint8))
-        if original_size != (128, 128):
-            mask_img = mask_img.resize(original_size, Image.LANCZOS)
-        mask_buffered = io.BytesIO()
-        mask_img.save(mask_buffered, format="PNG")
-        mask_str = base64.b64encode(mask_buffered.getvalue()).decode()
+        result = await segment_image(image_data)
         
+        # Base64-encode the PNGs only at the JSON response boundary
         return {
             "success": True,
-            "tumor_pixels": tumor_pixels,
-            "total_pixels": total_pixels,
-            "tumor_percentage": round(tumor_percentage, 2),
-            "segmented_image": img_str,
-            "mask": mask_str,
-            "original_size": list(original_size),
+            "tumor_pixels": result["tumor_pixels"],
+            "total_pixels": result["total_pixels"],
+            "tumor_percentage": result["tumor_percentage"],
+            "segmented_image": base64.b64encode(result["segmented_png"]).decode(),
+            "mask": base64.b64encode(result["mask_png"]).decode(),
+            "original_size": result["original_size"],
             "model_size": [128, 128]
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+@app.post("/predict-binary")
+async def predict_tumor_binary(file: UploadFile = File(...), output: str = "overlay"):
+    """
+    Predict tumor segmentation and return the PNG directly, without base64/JSON wrapping
+    Args:
+        file: Uploaded image file
+        output: "overlay" for the segmentation overlay, "mask" for the raw mask, or "both"
+    Returns:
+        PNG image (multipart/mixed overlay + mask for "both"), with tumor statistics in X-Tumor-* response headers
+    """
+    if model is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Please ensure the model file exists at the specified path."
+        )
+    
+    if output not in ("overlay", "mask", "both"):
+        raise HTTPException(status_code=400, detail="output must be 'overlay', 'mask' or 'both'")
+    
+    if not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="File must be an image")
+    
+    try:
+        # Read image file and run segmentation
+        image_data = await file.read()
+        result = await segment_image(image_data)
+        
+        headers = {
+            "X-Tumor-Pixels": str(result["tumor_pixels"]),
+            "X-Total-Pixels": str(result["total_pixels"]),
+            "X-Tumor-Percentage": str(result["tumor_percentage"])
+        }
+        
+        # Both images in one response, so clients that show both make a single round-trip
+        if output == "both":
+            body, content_type = encode_multipart_pngs({
+                "overlay": result["segmented_png"],
+                "mask": result["mask_png"]
+            })
+            return Response(content=body, media_type=content_type, headers=headers)
+        
+        png_bytes = result["segmented_png"] if output == "overlay" else result["mask_png"]
+        return Response(content=png_bytes, media_type="image/png", headers=headers)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
 @app.post("/batch-predict")
 async def batch_predict(files: list[UploadFile] = File(...)):
     """
@@ -271,41 +725,58 @@ async def batch_predict(files: list[UploadFile] = File(...)):
             detail="Maximum 10 images allowed per batch"
         )
     
-    results = []
+    results = [None] * len(files)
+    batch = []
+    batch_indices = []
+    
+    # Read all uploads concurrently
+    image_datas = await asyncio.gather(*(file.read() for file in files), return_exceptions=True)
+    
+    # Decode and preprocess in worker threads (OpenCV releases the GIL) so the model sees one minibatch
+    processed = await asyncio.gather(
+        *(asyncio.to_thread(decode_and_preprocess, data) for data in image_datas if not isinstance(data, Exception)),
+        return_exceptions=True
+    )
+    processed = iter(processed)
+    
+    for idx, (file, image_data) in enumerate(zip(files, image_datas)):
+        item = image_data if isinstance(image_data, Exception) else next(processed)
+        if isinstance(item, Exception):
+            results[idx] = {
+                "filename": file.filename,
+                "success": False,
+                "error": str(item)
+            }
+        else:
+            batch.append(item)
+            batch_indices.append(idx)
     
-    for idx, file in enumerate(files):
+    if batch:
         try:
-            # Read image file
-            image_data = await file.read()
-            image = Image.open(io.BytesIO(image_data))
+            # Single forward pass over the stacked (N, 128, 128, 1) batch, off the event loop
+            predictions = await asyncio.to_thread(run_inference, np.stack(batch, axis=0))
             
-            # Preprocess image
-            processed_img = preprocess_image(image)
-            
-            # Make prediction
-            prediction = model.predict(processed_img, verbose=0)
-            
-            # Extract mask
-            mask = prediction[0, :, :, 0]
-            
-            # Calculate statistics
-            tumor_pixels = int(np.sum(mask > 0.5))
-            total_pixels = mask.shape[0] * mask.shape[1]
-            tumor_percentage = (tumor_pixels / total_pixels) * 100
-            
-            results.append({
-                "filename": file.filename,
-                "success": True,
-                "tumor_pixels": tumor_pixels,
-                "tumor_percentage": round(tumor_percentage, 2)
-            })
+            # Calculate statistics for every mask at once
+            tumor_pixel_counts = np.count_nonzero(predictions > 0.5, axis=(1, 2, 3))
+            total_pixels = predictions.shape[1] * predictions.shape[2]
             
+            for idx, count in zip(batch_indices, tumor_pixel_counts):
+                tumor_pixels = int(count)
+                tumor_percentage = (tumor_pixels / total_pixels) * 100
+                results[idx] = {
+                    "filename": files[idx].filename,
+                    "success": True,
+                    "tumor_pixels": tumor_pixels,
+                    "tumor_percentage": round(tumor_percentage, 2)
+                }
+                
         except Exception as e:
-            results.append({
-                "filename": file.filename,
-                "success": False,
-                "error": str(e)
-            })
+            for idx in batch_indices:
+                results[idx] = {
+                    "filename": files[idx].filename,
+                    "success": False,
+                    "error": str(e)
+                }
     
     return {
         "total_images": len(files),
@@ -317,6 +788,11 @@ async def batch_predict(files: list[UploadFile] = File(...)):
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Starting Brain Tumor Segmentation API...")
-    print("📍 API will be available at http://localhost:8000")
-    print("📖 Documentation at http://localhost:8000/docs")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    print(f"📍 API will be available at http://localhost:{config.API_PORT}")
+    print(f"📖 Documentation at http://localhost:{config.API_PORT}/docs")
+    if config.API_WORKERS > 1:
+        # Multiple worker processes need an import string; each worker loads its own model copy
+        print(f"👷 Starting {config.API_WORKERS} worker processes")
+        uvicorn.run("backend:app", host=config.API_HOST, port=config.API_PORT, workers=config.API_WORKERS)
+    else:
+        uvicorn.run(app, host=config.API_HOST, port=config.API_PORT)
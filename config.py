@@ -3,7 +3,7 @@
 # API Configuration
 API_HOST = "0.0.0.0"
 API_PORT = 8000
-API_WORKERS = 1
+API_WORKERS = 1  # Worker processes for `python backend.py`; raise on CPU-only hosts, keep 1 on GPU
 
 # Model Configuration
 MODEL_PATH = "unet_brain_tumor_final.keras"
@@ -31,6 +31,7 @@ OVERLAY_ALPHA = 0.3
 # Performance
 ENABLE_GPU = True
 TF_MEMORY_GROWTH = True
+ENABLE_XLA = True
 
 # Logging
 LOG_LEVEL = "INFO"
@@ -2,19 +2,29 @@
 Demo script showing how to use the Brain Tumor Segmentation API
 """
 
+import atexit
+import contextlib
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-import base64
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.util.retry import Retry
+import pybase64 as base64  # SIMD-accelerated drop-in for the stdlib module
 from pathlib import Path
-from PIL import Image
-import io
 
 API_URL = "http://localhost:8000"
 
+# One keep-alive session for every example, so calls reuse TCP connections instead of reconnecting;
+# the pool is sized for the concurrent example's 10 worker threads
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=Retry(total=2, backoff_factor=0.1)))
+atexit.register(session.close)
+
 def save_base64_image(base64_string, output_path):
     """Save a base64 encoded image to file"""
-    img_data = base64.b64decode(base64_string)
-    img = Image.open(io.BytesIO(img_data))
-    img.save(output_path)
+    # The payload is already a PNG, so write it as-is instead of decoding and re-encoding it with PIL
+    Path(output_path).write_bytes(base64.b64decode(base64_string))
     print(f"✅ Saved image to: {output_path}")
 
 def example_1_single_prediction():
@@ -35,25 +45,28 @@ def example_1_single_prediction():
     # Send request
     with open(test_image, 'rb') as f:
         files = {'file': (test_image.name, f, 'image/png')}
-        response = requests.post(f"{API_URL}/predict", files=files)
+        response = session.post(f"{API_URL}/predict", files=files)
     
     if response.status_code == 200:
-        result = response.json()
+        result = orjson.loads(response.content)
         print("\n✅ Prediction successful!")
         print(f"   Tumor pixels: {result['tumor_pixels']}")
         print(f"   Total pixels: {result['total_pixels']}")
         print(f"   Tumor percentage: {result['tumor_percentage']}%")
         
-        # Save segmented image
+        # Save segmented image and mask; the two writes are independent, so run them side by side
         output_path = "demo_output_segmented.png"
-        save_base64_image(result['segmented_image'], output_path)
-        
-        # Save mask
         mask_path = "demo_output_mask.png"
-        save_base64_image(result['mask'], mask_path)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            saves = [
+                executor.submit(save_base64_image, result['segmented_image'], output_path),
+                executor.submit(save_base64_image, result['mask'], mask_path)
+            ]
+        for future in saves:
+            future.result()  # Re-raise any write error
         
     else:
-        print(f"❌ Error: {response.json()}")
+        print(f"❌ Error {response.status_code}: {response.text}")
 
 def example_2_batch_prediction():
     """Example 2: Batch prediction"""
@@ -71,20 +84,23 @@ def example_2_batch_prediction():
     
     print(f"📤 Uploading {len(test_images)} images...")
     
-    # Prepare files
-    files = []
-    for img_path in test_images:
-        files.append(('files', (img_path.name, open(img_path, 'rb'), 'image/png')))
-    
-    # Send request
-    response = requests.post(f"{API_URL}/batch-predict", files=files)
-    
-    # Close file handles
-    for _, (_, file_handle, _) in files:
-        file_handle.close()
+    # Prepare files; the ExitStack closes every handle even if the request raises
+    with contextlib.ExitStack() as stack:
+        files = [
+            ('files', (img_path.name, stack.enter_context(open(img_path, 'rb')), 'image/png'))
+            for img_path in test_images
+        ]
+        
+        # Stream the multipart body from the open handles instead of building it in memory first
+        encoder = MultipartEncoder(fields=files)
+        response = session.post(
+            f"{API_URL}/batch-predict",
+            data=encoder,
+            headers={'Content-Type': encoder.content_type}
+        )
     
     if response.status_code == 200:
-        result = response.json()
+        result = orjson.loads(response.content)
         print(f"\n✅ Batch prediction completed!")
         print(f"   Total images: {result['total_images']}")
         print(f"   Successful: {result['successful']}")
@@ -97,7 +113,44 @@ def example_2_batch_prediction():
             else:
                 print(f"   • {r['filename']}: FAILED")
     else:
-        print(f"❌ Error: {response.json()}")
+        print(f"❌ Error {response.status_code}: {response.text}")
+
+def _predict_file(img_path):
+    """POST a single image to /predict"""
+    with open(img_path, 'rb') as f:
+        files = {'file': (img_path.name, f, 'image/png')}
+        return session.post(f"{API_URL}/predict", files=files)
+
+def example_2b_concurrent_predictions():
+    """Example 2b: Concurrent single-image predictions"""
+    print("\n" + "="*60)
+    print("Example 2b: Concurrent Predictions")
+    print("="*60)
+    
+    test_images = sorted(Path("Test_images").glob("*.png"))
+    
+    if not test_images:
+        print("❌ No test images found!")
+        return
+    
+    print(f"📤 Uploading {len(test_images)} images concurrently...")
+    
+    print("\n📊 Results:")
+    # requests releases the GIL while waiting on the socket, so the threads overlap the round-trips
+    # and wall time is roughly the slowest request instead of the sum of all of them
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        futures = {executor.submit(_predict_file, p): p for p in test_images}
+        for future in as_completed(futures):
+            img_path = futures[future]
+            try:
+                response = future.result()
+            except requests.RequestException as e:
+                print(f"   • {img_path.name}: FAILED ({e})")
+                continue
+            if response.status_code == 200:
+                print(f"   • {img_path.name}: {orjson.loads(response.content)['tumor_percentage']}% tumor")
+            else:
+                print(f"   • {img_path.name}: FAILED ({response.status_code})")
 
 def example_3_custom_image():
     """Example 3: Using a custom image"""
@@ -130,10 +183,10 @@ def example_4_get_model_info():
     print("Example 4: Model Information")
     print("="*60)
     
-    response = requests.get(f"{API_URL}/model-info")
+    response = session.get(f"{API_URL}/model-info")
     
     if response.status_code == 200:
-        info = response.json()
+        info = orjson.loads(response.content)
         print("\n📊 Model Details:")
         print(f"   Name: {info['model_name']}")
         print(f"   Input shape: {info['input_shape']}")
@@ -141,14 +194,14 @@ def example_4_get_model_info():
         print(f"   Total parameters: {info['total_params']:,}")
         print(f"   Architecture: {info['architecture']}")
     else:
-        print(f"❌ Error: {response.json()}")
+        print(f"❌ Error {response.status_code}: {response.text}")
 
 def check_server():
     """Check if server is running"""
     try:
-        response = requests.get(f"{API_URL}/health", timeout=2)
+        response = session.get(f"{API_URL}/health", timeout=2)
         if response.status_code == 200:
-            health = response.json()
+            health = orjson.loads(response.content)
             if health.get('model_loaded'):
                 return True
             else:
@@ -187,6 +240,7 @@ def main():
     try:
         example_1_single_prediction()
         example_2_batch_prediction()
+        example_2b_concurrent_predictions()
         example_3_custom_image()
         example_4_get_model_info()
         
@@ -1,10 +1,17 @@
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import requests
-import base64
+import hashlib
+import html
 import io
 import json
 import mimetypes
+import mmap
+import os
+import re
+import urllib.parse
+import orjson
+import pandas as pd
 import streamlit.components.v1 as components
 
 ROOT = Path(__file__).parent
@@ -42,38 +49,240 @@ FOLDER_INFO = {
     }
 }
 
-def parse_captions(caption_text):
-    """Parse caption.txt file to extract individual captions with their numbers/titles"""
+# A caption starts at a "N. " line (or a "⭐" line in the alternative format) and runs until the next one;
+# matching runs on the raw file bytes so only the captions themselves are ever UTF-8 decoded
+_STAR = '⭐'.encode('utf-8')
+_CAPTION_RE = re.compile(rb'^(?:(\d+)\. (.*?)|(' + _STAR + rb'.*?))(?=^\d+\. |^' + _STAR + rb'|\Z)', re.MULTILINE | re.DOTALL)
+
+def parse_captions(caption_data):
+    """Parse caption.txt bytes to extract individual captions with their numbers/titles"""
     captions = {}
-    lines = caption_text.strip().split('\n')
-    current_num = None
-    current_text = []
+    for match in _CAPTION_RE.finditer(caption_data.strip()):
+        if match[1] is not None:
+            captions[int(match[1])] = match[2].decode('utf-8', errors='ignore').strip()
+        else:
+            # Star captions carry no number, so they are numbered sequentially
+            captions[len(captions) + 1] = match[3].decode('utf-8', errors='ignore').strip()
+    return captions
+
+@st.cache_resource(show_spinner=False)
+def load_stats_assets(stats_dir):
+    """Read every JSON stats file and caption under Stats/ in a single directory walk"""
+    if not os.path.isdir(stats_dir):
+        return {}
+    # os.walk yields plain name strings, so only the files we keep are ever turned into paths
+    paths = [
+        os.path.join(dirpath, name)
+        for dirpath, _, filenames in os.walk(stats_dir)
+        for name in filenames
+        if name.endswith(('.json', '.txt'))
+    ]
+    
+    def read(path):
+        with open(path, 'rb') as f:
+            return os.fstat(f.fileno()).st_mtime, f.read()
+    
+    # File reads release the GIL, so a few threads overlap the disk waits on a cold start
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        contents = executor.map(read, paths)
+        return {
+            os.path.relpath(path, stats_dir).replace(os.sep, '/'): entry
+            for path, entry in zip(paths, contents)
+        }
+
+def read_stats_asset(file_path, mtime):
+    """Return the raw bytes of a Stats/ file, preferring the preloaded copy while it is still current"""
+    path = Path(file_path)
+    # Callers cache the parsed result, so the preloaded bytes are handed out once and then released
+    cached = load_stats_assets(str(STATS_DIR)).pop(path.relative_to(STATS_DIR).as_posix(), None)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    return path.read_bytes()
+
+# The mtime argument is part of each cache key, so editing a stats file invalidates its entry
+@st.cache_data(show_spinner=False)
+def load_json_file(file_path, mtime):
+    """Read and parse a JSON stats file (cached across reruns)"""
+    raw = read_stats_asset(file_path, mtime)
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # orjson rejects NaN/Infinity literals that Python's json.dump emits
+        return json.loads(raw)
+
+@st.cache_data(show_spinner=False)
+def dump_json_file(file_path, mtime):
+    """Serialize a JSON stats file once for st.json so reruns skip re-encoding"""
+    return orjson.dumps(load_json_file(file_path, mtime)).decode()
+
+@st.cache_data(show_spinner=False)
+def load_caption(file_path, mtime):
+    """Read a caption.txt file (cached across reruns)"""
+    return read_stats_asset(file_path, mtime).decode('utf-8', errors='ignore')
+
+@st.cache_data(show_spinner=False)
+def load_captions(file_path, mtime):
+    """Read and parse a numbered caption.txt file (cached across reruns)"""
+    return parse_captions(read_stats_asset(file_path, mtime))
+
+@st.cache_data(show_spinner=False)
+def training_summary(file_path, mtime):
+    """Extract the headline metrics of a training history file once"""
+    data = load_json_file(file_path, mtime)
+    return {
+        "epochs": len(data["epochs"]),
+        "final_train_loss": data["train_loss"][-1],
+        "final_val_loss": data["val_loss"][-1],
+        "final_train_dice": data["train_dice"][-1],
+        "final_val_dice": data["val_dice"][-1]
+    }
+
+# st.json ships the whole document to the browser; above this size link to the file instead
+RAW_JSON_MAX_CHARS = 256_000
+
+def render_json(file_path, mtime, served_url):
+    """Render a JSON stats file with st.json, or its top-level keys and a link when it is too large"""
+    raw_json = dump_json_file(file_path, mtime)
+    if len(raw_json) < RAW_JSON_MAX_CHARS:
+        st.json(raw_json)
+        return
+    data = load_json_file(file_path, mtime)
+    if isinstance(data, dict):
+        st.markdown("**Top-level keys:** " + ", ".join(f"`{key}`" for key in data))
+    st.caption(f"Raw JSON omitted ({len(raw_json) // 1024:,} KB). [Open {Path(file_path).name} from the backend]({served_url})")
+
+@st.cache_resource(show_spinner=False)
+def load_stats_table(file_path, mtime, key, with_index=False):
+    """Build the DataFrame for one list-of-rows field of a JSON stats file once (cached across reruns)"""
+    rows = load_json_file(file_path, mtime)[key]
+    df = pd.DataFrame(rows)
+    if with_index:
+        df.insert(0, "Index", range(1, len(df) + 1))
+    return df
+
+@st.cache_data(ttl=300, show_spinner=False)
+def list_stats_folders(stats_dir, folder_keys):
+    """Return the folder keys that exist as directories under Stats/ (cached so reruns skip the checks)"""
+    root = Path(stats_dir)
+    return [folder_key for folder_key in folder_keys if (root / folder_key).is_dir()]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def list_files(dir_path, suffixes):
+    """List filenames with the given suffixes in one directory pass, sorted (cached so reruns skip the scan)"""
+    if not os.path.isdir(dir_path):
+        return []
+    # scandir entries carry the file type from readdir, so no per-file stat is needed
+    with os.scandir(dir_path) as entries:
+        return sorted(e.name for e in entries if e.name.endswith(suffixes) and e.is_file())
+
+@st.cache_data(show_spinner=False)
+def list_test_images(dir_path, dir_mtime):
+    """List test image filenames once per directory mtime (adding or removing a file bumps it)"""
+    if dir_mtime is None:
+        return []
+    with os.scandir(dir_path) as entries:
+        return sorted(
+            e.name for e in entries
+            if e.name.lower().endswith(('.png', '.jpg', '.jpeg')) and e.is_file()
+        )
+
+@st.cache_data(show_spinner=False)
+def load_image_bytes(file_path, mtime):
+    """Read a test image once per modification time so reruns don't go back to disk"""
+    return Path(file_path).read_bytes()
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """Shared HTTP session so backend calls reuse pooled keep-alive connections across reruns"""
+    import requests
+    session = requests.Session()
+    # max_retries only re-attempts failed connections, so a POST is never sent twice
+    adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=3)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def fetch_png(backend_url, filename, fh, output="overlay"):
+    """POST an image to /predict-binary and return the response (PNG or multipart body, stats in X-Tumor-* headers)"""
+    fh.seek(0)
+    files = {'file': (filename, fh, mimetypes.guess_type(filename)[0] or 'image/png')}
+    return get_http_session().post(
+        f"{backend_url}/predict-binary",
+        params={"output": output},
+        files=files,
+        headers={"Accept": "multipart/mixed" if output == "both" else "image/png"},
+        timeout=60
+    )
+
+# Uploads with a longer edge than this are downscaled before posting; the model only sees 128x128
+UPLOAD_MAX_EDGE = 1024
+
+def shrink_for_upload(fh, filename, max_edge=UPLOAD_MAX_EDGE):
+    """Downscale an oversized image and re-encode it as PNG; images that already fit are returned unchanged"""
+    from PIL import Image
+    fh.seek(0)
+    with Image.open(fh) as img:  # Only the header is read to get the size
+        if max(img.size) <= max_edge:
+            return fh, filename
+        img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, format='PNG', compress_level=6)
+    buf.seek(0)
+    return buf, Path(filename).with_suffix('.png').name
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def run_prediction(backend_url, file_hash, filename, _fh):
+    """Segment an image via the backend, cached on its content hash (the file object itself isn't hashed)"""
+    _fh, filename = shrink_for_upload(_fh, filename)
+    from requests_toolbelt.multipart.decoder import MultipartDecoder
+    # Overlay and mask come back as raw PNG parts of one response, so there is no base64/JSON round-trip to undo
+    resp = fetch_png(backend_url, filename, _fh, output="both")
+    resp.raise_for_status()  # Errors propagate instead of being cached
+    overlay_part, mask_part = MultipartDecoder.from_response(resp).parts
+    return {
+        "tumor_percentage": float(resp.headers.get('X-Tumor-Percentage', 0)),
+        "tumor_pixels": int(resp.headers.get('X-Tumor-Pixels', 0)),
+        "total_pixels": int(resp.headers.get('X-Total-Pixels', 0)),
+        "overlay_png": overlay_part.content,
+        "mask_png": mask_part.content
+    }
+
+@st.cache_data(ttl=15, show_spinner=False)
+def backend_up(backend_url):
+    """Probe the backend's /health endpoint with a bodiless HEAD (cached briefly so each rerun doesn't probe it)"""
+    try:
+        return get_http_session().head(f"{backend_url}/health", timeout=1).ok
+    except Exception:
+        return False
+
+@st.cache_data(show_spinner=False)
+def load_html(file_path, mtime):
+    """Read an HTML report for inline embedding when the backend can't serve it"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""  # mmap can't map an empty file
+        # Decode straight from the mapped pages, skipping the intermediate bytes copy of a multi-MB report
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, 'utf-8', 'ignore')
+
+def show_prediction(prediction):
+    """Render a stored segmentation result (metrics, overlay and mask)"""
+    # Metrics
+    col_a, col_b = st.columns(2)
+    with col_a:
+        st.metric("🎯 Tumor Percentage", f"{prediction['tumor_percentage']:.2f}%")
+    with col_b:
+        st.metric("📍 Tumor Pixels", f"{prediction['tumor_pixels']:,}")
     
-    for line in lines:
-        # Check if line starts with a number (e.g., "1. ", "2. ", etc.)
-        if line.strip() and line[0].isdigit() and '. ' in line:
-            # Save previous caption if exists
-            if current_num is not None:
-                captions[current_num] = '\n'.join(current_text).strip()
-            # Start new caption
-            parts = line.split('. ', 1)
-            current_num = int(parts[0].strip())
-            current_text = [parts[1] if len(parts) > 1 else '']
-        elif line.startswith('⭐'):
-            # Alternative format with stars
-            if current_num is not None:
-                captions[current_num] = '\n'.join(current_text).strip()
-            # Extract caption number from following content or use sequential
-            current_num = len(captions) + 1
-            current_text = [line]
-        elif current_num is not None:
-            current_text.append(line)
+    st.caption(f"Total pixels analyzed: {prediction['total_pixels']:,}")
     
-    # Save last caption
-    if current_num is not None:
-        captions[current_num] = '\n'.join(current_text).strip()
+    # Segmentation overlay
+    st.markdown("**🖼️ Segmentation Overlay**")
+    st.image(prediction["overlay_png"], caption="Tumor regions highlighted in red with green contours", use_container_width=True)
     
-    return captions
+    # Binary mask
+    with st.expander("Show binary mask"):
+        st.image(prediction["mask_png"], caption="Binary segmentation mask", use_container_width=True)
 
 # Backend URL
 if 'backend_url' not in st.session_state:
@@ -98,12 +307,8 @@ if page == "📊 Statistics":
     st.sidebar.subheader("Select Statistics Category")
     
     # Get available folders
-    available_folders = []
-    if STATS_DIR.exists():
-        for folder_key in FOLDER_INFO.keys():
-            folder_path = STATS_DIR / folder_key
-            if folder_path.exists():
-                available_folders.append(folder_key)
+    # The keys are passed in so editing FOLDER_INFO invalidates the cached list
+    available_folders = list_stats_folders(str(STATS_DIR), tuple(FOLDER_INFO))
     
     if not available_folders:
         st.warning("No statistics folders found!")
@@ -127,31 +332,44 @@ if page == "📊 Statistics":
         captions = {}
         caption_file = folder_path / "caption.txt"
         if caption_file.exists() and folder_meta.get("has_captions", False):
-            caption_text = caption_file.read_text(encoding='utf-8', errors='ignore')
-            captions = parse_captions(caption_text)
+            captions = load_captions(str(caption_file), caption_file.stat().st_mtime)
         elif caption_file.exists():
             # For folders without numbered captions (cap 3, cap 6), show as single block
-            caption_text = caption_file.read_text(encoding='utf-8', errors='ignore')
+            caption_text = load_caption(str(caption_file), caption_file.stat().st_mtime)
             with st.expander("📝 About this section", expanded=True):
                 st.markdown(caption_text)
         
-        # Get all HTML and JSON files in the folder
-        html_files = sorted(folder_path.glob("*.html"))
-        json_files = sorted(folder_path.glob("*.json"))
+        # Get all HTML and JSON files in the folder (listing cached across reruns)
+        entries = list_files(str(folder_path), ('.html', '.json'))
+        html_files = [folder_path / name for name in entries if name.endswith('.html')]
+        json_files = [folder_path / name for name in entries if name.endswith('.json')]
         
         # Display HTML visualizations with captions
         if html_files:
             st.subheader("📊 Visualizations")
+            # components.iframe never fails on the Python side, so probe the backend explicitly
+            serve_from_backend = backend_up(backend_url)
+            if not serve_from_backend:
+                st.warning("⚠️ Backend unreachable; embedding reports directly")
             for idx, html_file in enumerate(html_files, start=1):
                 st.markdown(f"### {html_file.stem.replace('_', ' ').title()}")
                 
-                # Try to load via backend first, fallback to local
-                served_url = f"{backend_url}/stats/{html_file.relative_to(STATS_DIR).as_posix()}"
-                try:
-                    components.iframe(served_url, height=600, scrolling=True)
-                except Exception:
-                    html_content = html_file.read_text(encoding='utf-8', errors='ignore')
-                    components.html(html_content, height=600, scrolling=True)
+                if serve_from_backend:
+                    # Let the browser fetch (and HTTP-cache) the report from the backend's /stats mount
+                    # instead of pushing the whole HTML through the Streamlit websocket on every rerun;
+                    # the mtime version keeps the URL stable until the file changes, so reruns hit the browser cache
+                    served_url = (
+                        f"{backend_url}/stats/{urllib.parse.quote(html_file.relative_to(STATS_DIR).as_posix())}"
+                        f"?v={html_file.stat().st_mtime_ns}"
+                    )
+                    # loading="lazy" lets the browser skip fetching reports until they are scrolled near
+                    components.html(
+                        f'<iframe src="{html.escape(served_url)}" loading="lazy" width="100%" height="600" '
+                        f'style="border:0" scrolling="auto"></iframe>',
+                        height=620
+                    )
+                else:
+                    components.html(load_html(str(html_file), html_file.stat().st_mtime), height=600, scrolling=True)
                 
                 # Display caption below the graph if available
                 if idx in captions:
@@ -166,51 +384,38 @@ if page == "📊 Statistics":
                 st.markdown(f"### {json_file.stem.replace('_', ' ').title()}")
                 
                 try:
-                    data = json.loads(json_file.read_text(encoding='utf-8'))
+                    json_mtime = json_file.stat().st_mtime
+                    json_url = f"{backend_url}/stats/{urllib.parse.quote(json_file.relative_to(STATS_DIR).as_posix())}"
+                    special_case = True
+                    data = load_json_file(str(json_file), json_mtime)
                     
                     # Special handling for training history
                     if "epochs" in data and "train_loss" in data:
+                        summary = training_summary(str(json_file), json_mtime)
                         col1, col2, col3 = st.columns(3)
                         with col1:
-                            st.metric("Total Epochs", len(data["epochs"]))
+                            st.metric("Total Epochs", summary["epochs"])
                         with col2:
-                            st.metric("Final Train Loss", f"{data['train_loss'][-1]:.6f}")
+                            st.metric("Final Train Loss", f"{summary['final_train_loss']:.6f}")
                         with col3:
-                            st.metric("Final Val Loss", f"{data['val_loss'][-1]:.6f}")
+                            st.metric("Final Val Loss", f"{summary['final_val_loss']:.6f}")
                         
                         col1, col2 = st.columns(2)
                         with col1:
-                            st.metric("Final Train Dice", f"{data['train_dice'][-1]:.4f}")
+                            st.metric("Final Train Dice", f"{summary['final_train_dice']:.4f}")
                         with col2:
-                            st.metric("Final Val Dice", f"{data['val_dice'][-1]:.4f}")
+                            st.metric("Final Val Dice", f"{summary['final_val_dice']:.4f}")
                     
                     # Special handling for dataset intensity and tumor stats (cap 2)
                     elif "average_tumor_percentage" in data and "intensity_stats" in data:
                         st.metric("Average Tumor Percentage", f"{data['average_tumor_percentage']:.4f}%")
                         
                         st.markdown("**📊 Intensity Statistics by Patient**")
-                        import pandas as pd
-                        # Paging logic for stats 2
-                        key2 = f"stats2_page_{json_file.name}"
-                        if key2 not in st.session_state:
-                            st.session_state[key2] = 0
-                        page_size2 = 10
-                        start2 = st.session_state[key2] * page_size2
-                        end2 = start2 + page_size2
-                        # Add correct index column for paging
-                        page_rows = data['intensity_stats'][start2:end2]
-                        if page_rows:
-                            df2 = pd.DataFrame(page_rows)
-                            df2.insert(0, "Index", range(start2 + 1, start2 + 1 + len(df2)))
-                            st.dataframe(df2, use_container_width=True)
-                            st.info(f"💡 Showing rows {start2+1} to {min(end2, len(data['intensity_stats']))} of {len(data['intensity_stats'])}")
-                        col_next2, _ = st.columns(2)
-                        if col_next2.button("Next", key=f"next_stats2_{json_file.name}"):
-                            if end2 < len(data['intensity_stats']):
-                                st.session_state[key2] += 1
-                        if st.session_state[key2] > 0:
-                            if col_next2.button("Previous", key=f"prev_stats2_{json_file.name}"):
-                                st.session_state[key2] -= 1
+                        table2 = load_stats_table(str(json_file), json_mtime, 'intensity_stats', with_index=True)
+                        # Hand the whole cached table to st.dataframe, which scrolls it client-side,
+                        # instead of paging with buttons that rerun the script on every click
+                        st.dataframe(table2, height=400, hide_index=True, use_container_width=True)
+                        st.info(f"💡 {len(table2)} rows; scroll the table to browse them")
                     
                     # Special handling for slice-level statistics (cap 4)
                     elif "summary_statistics" in data and "sample_rows" in data:
@@ -231,36 +436,23 @@ if page == "📊 Statistics":
                                 st.metric("Max", f"{metric_data['max']:.4f}")
                         
                         st.markdown("**📋 Sample Data**")
-                        import pandas as pd
-                        # Paging logic for stats 4
-                        key4 = f"stats4_page_{json_file.name}"
-                        if key4 not in st.session_state:
-                            st.session_state[key4] = 0
-                        page_size4 = 5
-                        start4 = st.session_state[key4] * page_size4
-                        end4 = start4 + page_size4
-                        df4 = pd.DataFrame(data['sample_rows'][start4:end4])
-                        st.dataframe(df4, use_container_width=True)
-                        st.info(f"💡 Showing rows {start4+1} to {min(end4, len(data['sample_rows']))} of {len(data['sample_rows'])}")
-                        col_next4, _ = st.columns(2)
-                        if col_next4.button("Next", key=f"next_stats4_{json_file.name}"):
-                            if end4 < len(data['sample_rows']):
-                                st.session_state[key4] += 1
-                        if st.session_state[key4] > 0:
-                            if col_next4.button("Previous", key=f"prev_stats4_{json_file.name}"):
-                                st.session_state[key4] -= 1
+                        table4 = load_stats_table(str(json_file), json_mtime, 'sample_rows')
+                        st.dataframe(table4, height=400, use_container_width=True)
+                        st.info(f"💡 {len(table4)} rows; scroll the table to browse them")
                     
                     else:
-                        # Generic JSON display
-                        st.json(data)
+                        # Generic JSON display (this already is the raw JSON, so no toggle below)
+                        render_json(str(json_file), json_mtime, json_url)
+                        special_case = False
                     
                     # Display caption below JSON if available
                     if idx in captions:
                         st.info(f"📝 {captions[idx]}")
                     
-                    # Show raw JSON in expandable section
-                    with st.expander("Show raw JSON data"):
-                        st.json(data)
+                    # Show raw JSON on request; an expander would still send the full payload
+                    # to the browser on every rerun even while collapsed
+                    if special_case and st.checkbox("Show raw JSON data", key=f"raw_json_{json_file.name}"):
+                        render_json(str(json_file), json_mtime, json_url)
                         
                 except Exception as e:
                     st.error(f"Error loading JSON: {e}")
@@ -278,92 +470,87 @@ elif page == "🔮 Prediction":
     with col1:
         st.subheader("📤 Input Image")
         
-        # Upload option
-        uploaded = st.file_uploader("Upload MRI Image", type=["png", "jpg", "jpeg"], help="Upload a brain MRI scan")
+        # Inputs live in a form so picking a file or test image doesn't rerun the script;
+        # only the submit button does
+        with st.form("predict", clear_on_submit=False):
+            # Upload option
+            uploaded = st.file_uploader("Upload MRI Image", type=["png", "jpg", "jpeg"], help="Upload a brain MRI scan")
+            
+            # Test images selection
+            st.markdown("**Or select from test images:**")
+            dir_mtime = TEST_IMAGES_DIR.stat().st_mtime if TEST_IMAGES_DIR.exists() else None
+            image_list = list_test_images(str(TEST_IMAGES_DIR), dir_mtime)
+            
+            selected_image = None
+            if image_list:
+                img_choice = st.selectbox("Choose test image:", options=["None"] + image_list)
+                if img_choice != "None":
+                    selected_image = TEST_IMAGES_DIR / img_choice
+            
+            # Prediction button
+            run = st.form_submit_button("🚀 Run Segmentation", type="primary", use_container_width=True)
         
-        # Test images selection
-        st.markdown("**Or select from test images:**")
-        image_list = []
-        if TEST_IMAGES_DIR.exists():
-            for p in sorted(TEST_IMAGES_DIR.iterdir()):
-                if p.is_file() and p.suffix.lower() in {'.png', '.jpg', '.jpeg'}:
-                    image_list.append(p)
-        
-        selected_image = None
-        if image_list:
-            img_choice = st.selectbox("Choose test image:", options=["None"] + [p.name for p in image_list])
-            if img_choice != "None":
-                selected_image = TEST_IMAGES_DIR / img_choice
-        
-        # Display selected/uploaded image
+        # Display selected/uploaded image, hashing its content to key the result cache and the stored result
+        input_key = None
         if uploaded is not None:
             st.image(uploaded, caption="Uploaded Image", use_container_width=True)
+            with uploaded.getbuffer() as view:
+                input_key = (hashlib.blake2b(view, digest_size=16).hexdigest(), backend_url)
         elif selected_image:
-            st.image(str(selected_image), caption=selected_image.name, use_container_width=True)
+            image_bytes = load_image_bytes(str(selected_image), selected_image.stat().st_mtime)
+            st.image(image_bytes, caption=selected_image.name, use_container_width=True)
+            input_key = (hashlib.blake2b(image_bytes, digest_size=16).hexdigest(), backend_url)
         else:
             st.info("👆 Please upload an image or select from test images")
-        
-        # Prediction button
-        run = st.button("🚀 Run Segmentation", type="primary", use_container_width=True)
     
     with col2:
         st.subheader("📊 Results")
         
         if run:
+            previous = st.session_state.pop("prediction", None)
             if uploaded is None and selected_image is None:
                 st.error("❌ No image selected or uploaded!")
             else:
-                file_bytes = None
-                filename = None
+                # Hand requests a file object rather than a bytes copy of the image; the result
+                # cache is keyed on the content hash so running the same image again skips the backend
                 if uploaded is not None:
-                    file_bytes = uploaded.read()
+                    fileobj = uploaded  # UploadedFile is already an in-memory file object
                     filename = uploaded.name
                 else:
+                    # Wrap the bytes cached for the preview above, so the file isn't read again
+                    fileobj = io.BytesIO(image_bytes)
                     filename = selected_image.name
-                    file_bytes = selected_image.read_bytes()
                 
-                with st.spinner("🔄 Running segmentation model..."):
-                    try:
-                        files = {'file': (filename, file_bytes, mimetypes.guess_type(filename)[0] or 'image/png')}
-                        resp = requests.post(f"{backend_url}/predict", files=files, timeout=60)
-                    except Exception as e:
-                        st.error(f"❌ Request failed: {e}")
-                        resp = None
+                file_hash = input_key[0]
+                if previous is not None and previous["key"] == input_key:
+                    # Same image and backend as the last run: reuse the stored result without a request
+                    result = previous
+                else:
+                    with st.spinner("🔄 Running segmentation model..."):
+                        try:
+                            result = run_prediction(backend_url, file_hash, filename, fileobj)
+                        except Exception as e:
+                            result = None
+                            error_resp = getattr(e, "response", None)
+                            if error_resp is None:
+                                st.error(f"❌ Request failed: {e}")
+                                st.warning("⚠️ No response from backend. Make sure the backend is running!")
+                            else:
+                                try:
+                                    st.error(f"❌ Backend error {error_resp.status_code}: {orjson.loads(error_resp.content)}")
+                                except Exception:
+                                    st.error(f"❌ Backend error {error_resp.status_code}: {error_resp.text}")
                 
-                if resp is None:
-                    st.warning("⚠️ No response from backend. Make sure the backend is running!")
-                elif resp.status_code == 200:
-                    data = resp.json()
+                if result is not None:
                     st.success("✅ Segmentation Complete!")
-                    
-                    # Metrics
-                    col_a, col_b = st.columns(2)
-                    with col_a:
-                        st.metric("🎯 Tumor Percentage", f"{data.get('tumor_percentage', 0):.2f}%")
-                    with col_b:
-                        st.metric("📍 Tumor Pixels", f"{data.get('tumor_pixels', 0):,}")
-                    
-                    st.caption(f"Total pixels analyzed: {data.get('total_pixels', 0):,}")
-                    
-                    # Segmentation overlay
-                    seg_b64 = data.get('segmented_image')
-                    if seg_b64:
-                        seg_bytes = base64.b64decode(seg_b64)
-                        st.markdown("**🖼️ Segmentation Overlay**")
-                        st.image(io.BytesIO(seg_bytes), caption="Tumor regions highlighted in red with green contours", use_container_width=True)
-                    
-                    # Binary mask
-                    mask_b64 = data.get('mask')
-                    if mask_b64:
-                        mask_bytes = base64.b64decode(mask_b64)
-                        with st.expander("Show binary mask"):
-                            st.image(io.BytesIO(mask_bytes), caption="Binary segmentation mask", use_container_width=True)
-                else:
-                    try:
-                        st.error(f"❌ Backend error {resp.status_code}: {resp.json()}")
-                    except Exception:
-                        st.error(f"❌ Backend error {resp.status_code}: {resp.text}")
-        else:
+                    # Keep the result so later reruns (any widget interaction) redisplay it without re-posting
+                    st.session_state.prediction = {**result, "key": input_key}
+        
+        # Show the stored result while the same image content and backend are still selected
+        prediction = st.session_state.get("prediction")
+        if prediction is not None and prediction["key"] == input_key:
+            show_prediction(prediction)
+        elif not run:
             st.info("👈 Configure input and click 'Run Segmentation' to begin")
 
 # ==================== MODEL ARCHITECTURE PAGE ====================
@@ -2,23 +2,26 @@
 System Check Script - Verify all requirements for the application
 """
 
+import importlib.util
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def check_python_version():
+def check_python_version(log=print):
     """Check Python version"""
-    print("🐍 Checking Python version...")
+    log("🐍 Checking Python version...")
     version = sys.version_info
     if version.major >= 3 and version.minor >= 9:
-        print(f"   ✅ Python {version.major}.{version.minor}.{version.micro}")
+        log(f"   ✅ Python {version.major}.{version.minor}.{version.micro}")
         return True
     else:
-        print(f"   ❌ Python {version.major}.{version.minor}.{version.micro} (requires 3.9+)")
+        log(f"   ❌ Python {version.major}.{version.minor}.{version.micro} (requires 3.9+)")
         return False
 
-def check_dependencies():
+def check_dependencies(log=print):
     """Check if required packages are installed"""
-    print("\n📦 Checking dependencies...")
+    log("\n📦 Checking dependencies...")
     
     required_packages = [
         'fastapi',
@@ -37,33 +40,25 @@ def check_dependencies():
     installed = []
     
     for package in required_packages:
-        # Special handling for PIL
-        if package == 'PIL':
-            package_import = 'PIL'
-        elif package == 'cv2':
-            package_import = 'cv2'
-        else:
-            package_import = package
-        
-        try:
-            __import__(package_import)
+        # find_spec only locates the module, so heavy packages like TensorFlow are never executed
+        if importlib.util.find_spec(package) is not None:
             installed.append(package)
-            print(f"   ✅ {package}")
-        except ImportError:
+            log(f"   ✅ {package}")
+        else:
             missing.append(package)
-            print(f"   ❌ {package} (not installed)")
+            log(f"   ❌ {package} (not installed)")
     
     if missing:
-        print(f"\n⚠️  Missing packages: {', '.join(missing)}")
-        print("   Run: pip install -r requirements.txt")
+        log(f"\n⚠️  Missing packages: {', '.join(missing)}")
+        log("   Run: pip install -r requirements.txt")
         return False
     else:
-        print(f"\n✅ All {len(installed)} required packages are installed!")
+        log(f"\n✅ All {len(installed)} required packages are installed!")
         return True
 
-def check_files():
+def check_files(log=print):
     """Check if required files exist"""
-    print("\n📁 Checking required files...")
+    log("\n📁 Checking required files...")
     
     required_files = {
         'app.py': 'Streamlit frontend',
@@ -83,23 +78,23 @@ def check_files():
             size = path.stat().st_size / (1024 * 1024)  # Size in MB
             found.append(file)
             if file.endswith('.keras'):
-                print(f"   ✅ {file} ({size:.1f} MB) - {description}")
+                log(f"   ✅ {file} ({size:.1f} MB) - {description}")
             else:
-                print(f"   ✅ {file} - {description}")
+                log(f"   ✅ {file} - {description}")
         else:
             missing.append(file)
-            print(f"   ❌ {file} - {description} (MISSING)")
+            log(f"   ❌ {file} - {description} (MISSING)")
     
     if missing:
-        print(f"\n⚠️  Missing files: {', '.join(missing)}")
+        log(f"\n⚠️  Missing files: {', '.join(missing)}")
         return False
     else:
-        print(f"\n✅ All {len(found)} required files are present!")
+        log(f"\n✅ All {len(found)} required files are present!")
         return True
 
-def check_directories():
+def check_directories(log=print):
     """Check if required directories exist"""
-    print("\n📂 Checking required directories...")
+    log("\n📂 Checking required directories...")
     
     required_dirs = {
         'Stats': 'Statistics and visualizations',
@@ -118,23 +113,24 @@ def check_directories():
         path = Path(dir_path)
         if path.exists() and path.is_dir():
             # Count files in directory
-            files = list(path.glob('*'))
+            with os.scandir(path) as entries:
+                file_count = sum(1 for _ in entries)
             found.append(dir_path)
-            print(f"   ✅ {dir_path} ({len(files)} files) - {description}")
+            log(f"   ✅ {dir_path} ({file_count} files) - {description}")
         else:
             missing.append(dir_path)
-            print(f"   ❌ {dir_path} - {description} (MISSING)")
+            log(f"   ❌ {dir_path} - {description} (MISSING)")
     
     if missing:
-        print(f"\n⚠️  Missing directories: {', '.join(missing)}")
+        log(f"\n⚠️  Missing directories: {', '.join(missing)}")
         return False
     else:
-        print(f"\n✅ All {len(found)} required directories are present!")
+        log(f"\n✅ All {len(found)} required directories are present!")
         return True
 
-def check_ports():
+def check_ports(log=print):
     """Check if required ports are available"""
-    print("\n🔌 Checking ports...")
+    log("\n🔌 Checking ports...")
     
     import socket
     
@@ -146,21 +142,30 @@ def check_ports():
     available = []
     in_use = []
     
+    def port_in_use(port):
+        # create_connection tries every address localhost resolves to (IPv6 and IPv4), and the
+        # short timeout keeps an unresponsive host from stalling the probe
+        try:
+            with socket.create_connection(('localhost', port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+    
+    # Probe all ports at once so the worst case is one timeout rather than one per port
+    with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+        results = dict(zip(ports, executor.map(port_in_use, ports)))
+    
     for port, service in ports.items():
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex(('localhost', port))
-        sock.close()
-        
-        if result == 0:
+        if results[port]:
             in_use.append(port)
-            print(f"   ⚠️  Port {port} - {service} (IN USE)")
+            log(f"   ⚠️  Port {port} - {service} (IN USE)")
         else:
             available.append(port)
-            print(f"   ✅ Port {port} - {service} (Available)")
+            log(f"   ✅ Port {port} - {service} (Available)")
     
     if in_use:
-        print(f"\n⚠️  Ports in use: {', '.join(map(str, in_use))}")
-        print("   If services are not running, these ports may need to be freed")
+        log(f"\n⚠️  Ports in use: {', '.join(map(str, in_use))}")
+        log("   If services are not running, these ports may need to be freed")
     
     return True  # Not critical for setup check
 
@@ -197,14 +202,29 @@ def main():
     print("  Brain Tumor Segmentation - System Check")
     print("="*60)
     
-    checks = [
-        ("Python Version", check_python_version()),
-        ("Dependencies", check_dependencies()),
-        ("Required Files", check_files()),
-        ("Required Directories", check_directories()),
-        ("Port Availability", check_ports())
+    check_funcs = [
+        ("Python Version", check_python_version),
+        ("Dependencies", check_dependencies),
+        ("Required Files", check_files),
+        ("Required Directories", check_directories),
+        ("Port Availability", check_ports)
     ]
     
+    def run(check):
+        lines = []
+        return check(lines.append), lines
+    
+    # The checks are independent I/O, so run them concurrently; each one collects its lines
+    # instead of printing, and they are printed afterwards in the usual order
+    with ThreadPoolExecutor(max_workers=len(check_funcs)) as executor:
+        outcomes = list(executor.map(run, [func for _, func in check_funcs]))
+    
+    checks = []
+    for (check_name, _), (result, lines) in zip(check_funcs, outcomes):
+        for line in lines:
+            print(line)
+        checks.append((check_name, result))
+    
     print_summary(checks)
 
 if __name__ == "__main__":
@@ -3,13 +3,23 @@ Test script for Brain Tumor Segmentation API
 Tests all endpoints and provides detailed feedback
 """
 
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.util.retry import Retry
 import json
+import orjson
 from pathlib import Path
 import time
 
 API_URL = "http://localhost:8000"
 
+# Shared session for all tests
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.2)))
+
 def print_header(text):
     """Print a formatted header"""
     print("\n" + "=" * 60)
@@ -20,9 +30,9 @@ def test_root():
     """Test root endpoint"""
     print_header("Testing Root Endpoint (GET /)")
     try:
-        response = requests.get(f"{API_URL}/")
+        response = session.get(f"{API_URL}/")
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        print(f"Response: {json.dumps(orjson.loads(response.content), indent=2)}")
         return response.status_code == 200
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -32,9 +42,9 @@ def test_health():
     """Test health check endpoint"""
     print_header("Testing Health Check (GET /health)")
     try:
-        response = requests.get(f"{API_URL}/health")
+        response = session.get(f"{API_URL}/health")
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        print(f"Response: {json.dumps(orjson.loads(response.content), indent=2)}")
         return response.status_code == 200
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -44,13 +54,14 @@ def test_model_info():
     """Test model info endpoint"""
     print_header("Testing Model Info (GET /model-info)")
     try:
-        response = requests.get(f"{API_URL}/model-info")
+        response = session.get(f"{API_URL}/model-info")
         print(f"Status Code: {response.status_code}")
-        if response.status_code == 200:
-            print(f"Response: {json.dumps(response.json(), indent=2)}")
+        data = orjson.loads(response.content)
+        if response.ok:
+            print(f"Response: {json.dumps(data, indent=2)}")
         else:
-            print(f"Error: {response.json()}")
-        return response.status_code == 200
+            print(f"Error: {data}")
+        return response.ok
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
@@ -76,12 +87,12 @@ def test_prediction():
     try:
         with open(test_image, 'rb') as f:
             files = {'file': (test_image.name, f, 'image/png')}
-            response = requests.post(f"{API_URL}/predict", files=files)
+            response = session.post(f"{API_URL}/predict", files=files)
         
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             print("\n✅ Prediction successful!")
             print(f"  • Tumor Pixels: {result['tumor_pixels']}")
             print(f"  • Total Pixels: {result['total_pixels']}")
@@ -92,7 +103,7 @@ def test_prediction():
             print(f"  • Mask: {len(result['mask'])} bytes (base64)")
             return True
         else:
-            print(f"❌ Error: {response.json()}")
+            print(f"❌ Error: {orjson.loads(response.content)}")
             return False
             
     except Exception as e:
@@ -117,20 +128,22 @@ def test_batch_prediction():
     print(f"Using {len(test_images)} test images")
     
     try:
-        files = []
-        for img_path in test_images:
-            files.append(('files', (img_path.name, open(img_path, 'rb'), 'image/png')))
-        
-        response = requests.post(f"{API_URL}/batch-predict", files=files)
-        
-        # Close file handles
-        for _, (_, file_handle, _) in files:
-            file_handle.close()
+        with contextlib.ExitStack() as stack:
+            files = [
+                ('files', (img_path.name, stack.enter_context(open(img_path, 'rb')), 'image/png'))
+                for img_path in test_images
+            ]
+            encoder = MultipartEncoder(fields=files)
+            response = session.post(
+                f"{API_URL}/batch-predict",
+                data=encoder,
+                headers={'Content-Type': encoder.content_type}
+            )
         
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             print("\n✅ Batch prediction successful!")
             print(f"  • Total Images: {result['total_images']}")
             print(f"  • Successful: {result['successful']}")
@@ -143,13 +156,53 @@ def test_batch_prediction():
                     print(f"    - {r['filename']}: FAILED - {r['error']}")
             return True
         else:
-            print(f"❌ Error: {response.json()}")
+            print(f"❌ Error: {orjson.loads(response.content)}")
             return False
             
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
 
+def test_concurrent_predictions():
+    """Test concurrent single-image predictions (POST /predict)"""
+    print_header("Testing Concurrent Predictions (POST /predict)")
+    
+    # Find test images
+    test_images_dir = Path("Test_images")
+    if not test_images_dir.exists():
+        print("❌ Test_images directory not found!")
+        return False
+    
+    test_images = list(test_images_dir.glob("*.png"))[:5]  # Use first 5 images
+    if not test_images:
+        print("❌ No test images found!")
+        return False
+    
+    print(f"Sending {len(test_images)} requests concurrently")
+    
+    def post_one(img_path):
+        with open(img_path, 'rb') as f:
+            files = {'file': (img_path.name, f, 'image/png')}
+            return session.post(f"{API_URL}/predict", files=files)
+    
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(post_one, test_images))
+        elapsed = time.perf_counter() - start
+        
+        failed = [img.name for img, r in zip(test_images, responses) if r.status_code != 200]
+        print(f"  • Completed in {elapsed:.2f}s")
+        print(f"  • Successful: {len(responses) - len(failed)}")
+        print(f"  • Failed: {len(failed)}")
+        for name in failed:
+            print(f"    - {name}: FAILED")
+        return not failed
+        
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("\n" + "=" * 60)
@@ -160,7 +213,7 @@ def main():
     print("⏳ Checking if server is running...")
     
     try:
-        requests.get(API_URL, timeout=2)
+        session.get(API_URL, timeout=2, stream=True).close()
         print("✅ Server is running!\n")
     except:
         print("\n❌ Cannot connect to API!")
@@ -176,12 +229,12 @@ def main():
         ("Health Check", test_health),
         ("Model Info", test_model_info),
         ("Single Prediction", test_prediction),
-        ("Batch Prediction", test_batch_prediction)
+        ("Batch Prediction", test_batch_prediction),
+        ("Concurrent Predictions", test_concurrent_predictions)
     ]
     
     results = []
     for test_name, test_func in tests:
-        time.sleep(0.5)  # Small delay between tests
         success = test_func()
         results.append((test_name, success))
     